@@ -13,12 +13,15 @@ Usage & Documentation:
 import os
 import sys
 
+from concurrent.futures import ThreadPoolExecutor
+
 from links import links_after_timestamp
 from index import write_links_index, load_links_index
-from archive_methods import archive_link
+from archive_methods import archive_link, INDEX_LOCK, ARCHIVING_STOPPED
 from config import (
     ARCHIVE_DIR,
     ONLY_NEW,
+    ARCHIVE_CONCURRENCY,
     OUTPUT_DIR,
     GIT_SHA,
 )
@@ -27,6 +30,8 @@ from util import (
     save_stdin_source,
 )
 from logs import (
+    ThreadBufferedStdout,
+    buffered_output,
     log_archiving_started,
     log_archiving_paused,
     log_archiving_finished,
@@ -37,26 +42,30 @@ __VERSION__ = GIT_SHA[:9]
 __DESCRIPTION__ = 'ArchiveBox: The self-hosted internet archive.'
 __DOCUMENTATION__ = 'https://github.com/pirate/ArchiveBox/wiki'
 
+HELP_TEXT = '\n'.join((
+    '{}\n'.format(__DESCRIPTION__),
+    'Documentation:',
+    '    {}\n'.format(__DOCUMENTATION__),
+    'UI Usage:',
+    '    Open output/index.html to view your archive.\n',
+    'CLI Usage:',
+    "    echo 'https://example.com' | ./archive\n",
+    '    ./archive ~/Downloads/bookmarks_export.html\n',
+    '    ./archive https://example.com/feed.rss\n',
+    '    ./archive 15109948213.123\n',
+))
+
 
 def print_help():
-    print('ArchiveBox: The self-hosted internet archive.\n')
-    print("Documentation:")
-    print("    https://github.com/pirate/ArchiveBox/wiki\n")
-    print("UI Usage:")
-    print("    Open output/index.html to view your archive.\n")
-    print("CLI Usage:")
-    print("    echo 'https://example.com' | ./archive\n")
-    print("    ./archive ~/Downloads/bookmarks_export.html\n")
-    print("    ./archive https://example.com/feed.rss\n")
-    print("    ./archive 15109948213.123\n")
+    print(HELP_TEXT)
 
 
 def main(*args):
-    if set(args).intersection(('-h', '--help', 'help')) or len(args) > 2:
+    if any(arg in ('-h', '--help', 'help') for arg in args) or len(args) > 2:
         print_help()
         raise SystemExit(0)
 
-    if set(args).intersection(('--version', 'version')):
+    if any(arg in ('--version', 'version') for arg in args):
         print('ArchiveBox version {}'.format(__VERSION__))
         raise SystemExit(0)
 
@@ -73,8 +82,7 @@ def main(*args):
             import_path, resume = args[1], None
 
     ### Set up output folder
-    if not os.path.exists(OUTPUT_DIR):
-        os.makedirs(OUTPUT_DIR)
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
 
     ### Handle ingesting urls piped in through stdin
     # (.e.g if user does cat example_urls.txt | ./archive)
@@ -114,9 +122,15 @@ def update_archive_data(import_path=None, resume=None):
     log_archiving_started(len(links), resume)
     idx, link = 0, 0
     try:
-        for idx, link in enumerate(links_after_timestamp(links, resume)):
-            link_dir = os.path.join(ARCHIVE_DIR, link['timestamp'])
-            archive_link(link_dir, link)
+        if ARCHIVE_CONCURRENCY > 1:
+            # each link is yielded while it's the earliest one still being
+            # archived, so idx & link track progress the same way as below
+            for idx, link in enumerate(archive_links_concurrently(links_after_timestamp(links, resume))):
+                pass
+        else:
+            for idx, link in enumerate(links_after_timestamp(links, resume)):
+                link_dir = os.path.join(ARCHIVE_DIR, link['timestamp'])
+                archive_link(link_dir, link)
 
     except KeyboardInterrupt:
         log_archiving_paused(len(links), idx, link and link['timestamp'])
@@ -133,5 +147,50 @@ def update_archive_data(import_path=None, resume=None):
     write_links_index(out_dir=OUTPUT_DIR, links=all_links, finished=True)
 
 
+def archive_links_concurrently(links):
+    """archive up to ARCHIVE_CONCURRENCY links at a time, yielding them in order.
+       the archive methods run as external processes so threads are enough
+    """
+
+    links = list(links)
+    ARCHIVING_STOPPED.clear()
+    stdout, sys.stdout = sys.stdout, ThreadBufferedStdout(sys.stdout)
+    executor = ThreadPoolExecutor(max_workers=ARCHIVE_CONCURRENCY)
+    futures = [
+        executor.submit(archive_link_with_buffered_output, os.path.join(ARCHIVE_DIR, link['timestamp']), link)
+        for link in links
+    ]
+    try:
+        for link, future in zip(links, futures):
+            yield link
+            future.result()
+    finally:
+        # on error or ctrl+c, drop the links that haven't started yet and tell
+        # the running ones to stop, then wait for them so that nothing is
+        # still writing to the index once the run is reported as paused
+        ARCHIVING_STOPPED.set()
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=True)
+        sys.stdout = stdout
+
+
+def archive_link_with_buffered_output(link_dir, link):
+    """archive a link in a worker thread, printing its whole log in one piece
+       once it's done so that the output of concurrent links doesn't interleave
+    """
+
+    output = None
+    try:
+        with buffered_output() as output:
+            return archive_link(link_dir, link)
+    finally:
+        # the log of a link that was stopped part-way is dropped along with its results
+        with INDEX_LOCK:
+            if output is not None and not ARCHIVING_STOPPED.is_set():
+                sys.stdout.write(output.getvalue())
+                sys.stdout.flush()
+
+
 if __name__ == '__main__':
     main(*sys.argv)
@@ -1,5 +1,6 @@
 import os
 
+from threading import Lock, Event
 from collections import defaultdict
 from datetime import datetime
 
@@ -64,6 +65,16 @@ class ArchiveError(Exception):
         self.hints = hints
 
 
+# the main index and the run stats are shared between links that are
+# being archived concurrently (see ARCHIVE_CONCURRENCY)
+INDEX_LOCK = Lock()
+
+# set when a concurrent run is interrupted or fails, links that are still
+# being archived then stop without saving anything (their commands were
+# killed by the ctrl+c too), the same as the one link a sequential run stops on
+ARCHIVING_STOPPED = Event()
+
+
 def archive_link(link_dir, link):
     """download the DOM, PDF, and a screenshot into a folder named after the link's timestamp"""
 
@@ -80,15 +91,21 @@ def archive_link(link_dir, link):
     )
     
     try:
-        is_new = not os.path.exists(link_dir)
-        if is_new:
+        # creating the folder doubles as the check for whether it's new
+        try:
             os.makedirs(link_dir)
+            is_new = True
+        except FileExistsError:
+            is_new = False
 
         link = load_json_link_index(link_dir, link)
         log_link_archiving_started(link_dir, link, is_new)
         stats = {'skipped': 0, 'succeeded': 0, 'failed': 0}
 
         for method_name, should_run, method_function in ARCHIVE_METHODS:
+            if ARCHIVING_STOPPED.is_set():
+                return link
+
             if method_name not in link['history']:
                 link['history'][method_name] = []
             
@@ -105,9 +122,13 @@ def archive_link(link_dir, link):
 
         # print('    ', stats)
 
-        write_link_index(link_dir, link)
-        patch_links_index(link)
-        log_link_archiving_finished(link_dir, link, is_new, stats)
+        with INDEX_LOCK:
+            if ARCHIVING_STOPPED.is_set():
+                return link
+
+            write_link_index(link_dir, link)
+            patch_links_index(link)
+            log_link_archiving_finished(link_dir, link, is_new, stats)
 
     except Exception as err:
         print('    ! Failed to archive link: {}: {}'.format(err.__class__.__name__, err))
@@ -613,7 +634,7 @@ def parse_archive_dot_org_response(response):
     for header in response.splitlines():
         if b':' not in header or not header.strip():
             continue
-        name, val = header.decode().split(':', 1)
+        name, _, val = header.decode().partition(':')
         headers[name.lower().strip()].append(val.strip())
 
     # Get successful archive url in "content-location" header or any errors
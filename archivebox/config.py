@@ -17,6 +17,7 @@ SHOW_PROGRESS =          os.getenv('SHOW_PROGRESS',          str(IS_TTY)
 ONLY_NEW =               os.getenv('ONLY_NEW',               'False'            ).lower() == 'true'
 MEDIA_TIMEOUT =          int(os.getenv('MEDIA_TIMEOUT',      '3600'))
 TIMEOUT =                int(os.getenv('TIMEOUT',            '60'))
+ARCHIVE_CONCURRENCY =    int(os.getenv('ARCHIVE_CONCURRENCY', '1'))
 OUTPUT_PERMISSIONS =     os.getenv('OUTPUT_PERMISSIONS',     '755'              )
 FOOTER_INFO =            os.getenv('FOOTER_INFO',            'Content is hosted for personal archiving purposes only.  Contact server owner for any takedown requests.',)
 
@@ -74,9 +75,12 @@ TEMPLATES_DIR = os.path.join(PYTHON_PATH, 'templates')
 CHROME_SANDBOX = os.getenv('CHROME_SANDBOX', 'True').lower() == 'true'
 USE_CHROME = FETCH_PDF or FETCH_SCREENSHOT or FETCH_DOM
 USE_WGET = FETCH_WGET or FETCH_WGET_REQUISITES or FETCH_WARC
+# links archived concurrently would all draw their progress bars over the same line
+SHOW_PROGRESS = SHOW_PROGRESS and ARCHIVE_CONCURRENCY <= 1
 WGET_AUTO_COMPRESSION = USE_WGET and WGET_BINARY and (not run([WGET_BINARY, "--compression=auto", "--help"], stdout=DEVNULL, stderr=DEVNULL).returncode)
 
 URL_BLACKLIST = URL_BLACKLIST and re.compile(URL_BLACKLIST, re.IGNORECASE)
+GIT_DOMAINS = frozenset(GIT_DOMAINS)
 
 ########################### Environment & Dependencies #########################
 
@@ -124,7 +128,9 @@ try:
             CHROME_BINARY = 'chromium-browser'
     # print('[i] Using Chrome binary: {}'.format(shutil.which(CHROME_BINARY) or CHROME_BINARY))
 
-    if CHROME_USER_DATA_DIR is None:
+    # chrome locks its profile folder, so links archived concurrently can't all
+    # run chrome with the same one (see below), and no profile is auto-detected
+    if CHROME_USER_DATA_DIR is None and ARCHIVE_CONCURRENCY <= 1:
         # Precedence: Chromium, Chrome, Beta, Canary, Unstable, Dev
         default_profile_paths = (
             '~/.config/chromium',
@@ -148,6 +154,11 @@ try:
                 break
     # print('[i] Using Chrome data dir: {}'.format(os.path.abspath(CHROME_USER_DATA_DIR)))
 
+    if CHROME_USER_DATA_DIR and ARCHIVE_CONCURRENCY > 1:
+        if USE_CHROME:
+            print('[!] Warning: CHROME_USER_DATA_DIR is ignored when ARCHIVE_CONCURRENCY > 1, chrome can\'t share one profile between several instances')
+        CHROME_USER_DATA_DIR = None
+
     CHROME_OPTIONS = {
         'TIMEOUT': TIMEOUT,
         'RESOLUTION': RESOLUTION,
@@ -193,7 +204,7 @@ try:
 
     ### Make sure curl is installed
     if FETCH_FAVICON or SUBMIT_ARCHIVE_DOT_ORG:
-        if run(['which', CURL_BINARY], stdout=DEVNULL, stderr=DEVNULL).returncode or run([CURL_BINARY, '--version'], stdout=DEVNULL, stderr=DEVNULL).returncode:
+        if not shutil.which(CURL_BINARY) or run([CURL_BINARY, '--version'], stdout=DEVNULL, stderr=DEVNULL).returncode:
             print('{red}[X] Missing dependency: curl{reset}'.format(**ANSI))
             print('    Install it, then confirm it works with: {} --version'.format(CURL_BINARY))
             print('    See https://github.com/pirate/ArchiveBox/wiki/Install for help.')
@@ -201,7 +212,12 @@ try:
 
     ### Make sure wget is installed and calculate version
     if FETCH_WGET or FETCH_WARC:
-        if run(['which', WGET_BINARY], stdout=DEVNULL, stderr=DEVNULL).returncode or run([WGET_BINARY, '--version'], stdout=DEVNULL, stderr=DEVNULL).returncode:
+        # keep the output of the --version check to parse the version from below
+        wget_version_result = (
+            shutil.which(WGET_BINARY)
+            and run([WGET_BINARY, '--version'], stdout=PIPE, stderr=DEVNULL, cwd=REPO_DIR)
+        )
+        if not wget_version_result or wget_version_result.returncode:
             print('{red}[X] Missing dependency: wget{reset}'.format(**ANSI))
             print('    Install it, then confirm it works with: {} --version'.format(WGET_BINARY))
             print('    See https://github.com/pirate/ArchiveBox/wiki/Install for help.')
@@ -209,7 +225,7 @@ try:
 
         WGET_VERSION = 'unknown'
         try:
-            wget_vers_str = run([WGET_BINARY, "--version"], stdout=PIPE, cwd=REPO_DIR).stdout.strip().decode()
+            wget_vers_str = wget_version_result.stdout.strip().decode()
             WGET_VERSION = wget_vers_str.split('\n')[0].split(' ')[2]
         except Exception:
             if USE_WGET:
@@ -219,7 +235,7 @@ try:
 
     ### Make sure chrome is installed and calculate version
     if FETCH_PDF or FETCH_SCREENSHOT or FETCH_DOM:
-        if run(['which', CHROME_BINARY], stdout=DEVNULL, stderr=DEVNULL).returncode:
+        if not shutil.which(CHROME_BINARY):
             print('{}[X] Missing dependency: {}{}'.format(ANSI['red'], CHROME_BINARY, ANSI['reset']))
             print('    Install it, then confirm it works with: {} --version'.format(CHROME_BINARY))
             print('    See https://github.com/pirate/ArchiveBox/wiki/Install for help.')
@@ -244,15 +260,14 @@ try:
 
         CHROME_VERSION = 'unknown'
         try:
-            chrome_vers_str = run([CHROME_BINARY, "--version"], stdout=PIPE, cwd=REPO_DIR).stdout.strip().decode()
-            CHROME_VERSION = [v for v in chrome_vers_str.strip().split(' ') if v.replace('.', '').isdigit()][0]
+            CHROME_VERSION = [v for v in version_str.strip().split(' ') if v.replace('.', '').isdigit()][0]
         except Exception:
             if USE_CHROME:
                 print('[!] Warning: unable to determine chrome version, is chrome installed and in your $PATH?')
 
     ### Make sure git is installed
     if FETCH_GIT:
-        if run(['which', GIT_BINARY], stdout=DEVNULL, stderr=DEVNULL).returncode or run([GIT_BINARY, '--version'], stdout=DEVNULL, stderr=DEVNULL).returncode:
+        if not shutil.which(GIT_BINARY) or run([GIT_BINARY, '--version'], stdout=DEVNULL, stderr=DEVNULL).returncode:
             print('{red}[X] Missing dependency: git{reset}'.format(**ANSI))
             print('    Install it, then confirm it works with: {} --version'.format(GIT_BINARY))
             print('    See https://github.com/pirate/ArchiveBox/wiki/Install for help.')
@@ -260,7 +275,7 @@ try:
 
     ### Make sure youtube-dl is installed
     if FETCH_MEDIA:
-        if run(['which', YOUTUBEDL_BINARY], stdout=DEVNULL, stderr=DEVNULL).returncode or run([YOUTUBEDL_BINARY, '--version'], stdout=DEVNULL, stderr=DEVNULL).returncode:
+        if not shutil.which(YOUTUBEDL_BINARY) or run([YOUTUBEDL_BINARY, '--version'], stdout=DEVNULL, stderr=DEVNULL).returncode:
             print('{red}[X] Missing dependency: youtube-dl{reset}'.format(**ANSI))
             print('    Install it, then confirm it was installed with: {} --version'.format(YOUTUBEDL_BINARY))
             print('    See https://github.com/pirate/ArchiveBox/wiki/Install for help.')
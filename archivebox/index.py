@@ -3,12 +3,19 @@ import json
 
 from datetime import datetime
 from string import Template
+from functools import lru_cache
 try:
     from distutils.dir_util import copy_tree
 except ImportError:
     print('[X] Missing "distutils" python package. To install it, run:')
     print('    pip install distutils')
 
+try:
+    # orjson's C parser is much faster at loading large index files, use it if available
+    from orjson import loads as parse_json
+except ImportError:
+    from json import loads as parse_json
+
 from config import (
     OUTPUT_DIR,
     TEMPLATES_DIR,
@@ -25,7 +32,7 @@ from util import (
     latest_output,
 )
 from parse import parse_links
-from links import validate_links
+from links import validate_links, fuzzy_url
 from logs import (
     log_indexing_process_started,
     log_indexing_started,
@@ -37,6 +44,14 @@ from logs import (
 TITLE_LOADING_MSG = 'Not yet archived...'
 
 
+@lru_cache(maxsize=None)
+def load_template(filename):
+    """read and compile a template from TEMPLATES_DIR, cached for the life of the process"""
+
+    with open(os.path.join(TEMPLATES_DIR, filename), 'r', encoding='utf-8') as f:
+        return Template(f.read())
+
+
 ### Homepage index for all the links
 
 def write_links_index(out_dir, links, finished=False):
@@ -74,6 +89,13 @@ def load_links_index(out_dir=OUTPUT_DIR, import_path=None):
     check_links_structure(all_links)
     num_new_links = len(all_links) - len(existing_links)
 
+    # pick the genuinely new links out of the merged list, so that they carry
+    # the merged & re-timestamped data instead of the raw imported values.
+    # urls are compared the same fuzzy way they were deduped in, since merging
+    # may have kept an imported variant of an existing link's url
+    existing_urls = {fuzzy_url(link['url']) for link in existing_links}
+    new_links = [link for link in all_links if fuzzy_url(link['url']) not in existing_urls]
+
     if import_path and parser_name:
         log_parsing_finished(num_new_links, parser_name)
 
@@ -105,7 +127,7 @@ def parse_json_links_index(out_dir=OUTPUT_DIR):
     index_path = os.path.join(out_dir, 'index.json')
     if os.path.exists(index_path):
         with open(index_path, 'r', encoding='utf-8') as f:
-            links = json.load(f)['links']
+            links = parse_json(f.read())['links']
             check_links_structure(links)
             return links
 
@@ -123,16 +145,13 @@ def write_html_links_index(out_dir, links, finished=False):
     with open(os.path.join(out_dir, 'robots.txt'), 'w+') as f:
         f.write('User-agent: *\nDisallow: /')
 
-    with open(os.path.join(TEMPLATES_DIR, 'index.html'), 'r', encoding='utf-8') as f:
-        index_html = f.read()
-
-    with open(os.path.join(TEMPLATES_DIR, 'index_row.html'), 'r', encoding='utf-8') as f:
-        link_row_html = f.read()
+    index_template = load_template('index.html')
+    link_row_template = load_template('index_row.html')
 
     full_links_info = (derived_link_info(link) for link in links)
 
     link_rows = '\n'.join(
-        Template(link_row_html).substitute(**{
+        link_row_template.substitute(**{
             **link,
             'title': (
                 link['title']
@@ -142,8 +161,11 @@ def write_html_links_index(out_dir, links, finished=False):
                 os.path.join('archive', link['timestamp'], 'favicon.ico')
                 # if link['is_archived'] else 'data:image/gif;base64,R0lGODlhAQABAAD/ACwAAAAAAQABAAACADs='
             ),
+            # derived archive_url is already the wget output path for pages,
+            # only static files need it recomputed (no filesystem access)
             'archive_url': urlencode(
-                wget_output_path(link) or 'index.html'
+                (wget_output_path(link) if link['is_static'] else link['archive_url'])
+                or 'index.html'
             ),
         })
         for link in full_links_info
@@ -161,7 +183,7 @@ def write_html_links_index(out_dir, links, finished=False):
     }
 
     with open(path, 'w', encoding='utf-8') as f:
-        f.write(Template(index_html).substitute(**template_vars))
+        f.write(index_template.substitute(**template_vars))
 
     chmod_file(path)
 
@@ -169,8 +191,9 @@ def write_html_links_index(out_dir, links, finished=False):
 def patch_links_index(link, out_dir=OUTPUT_DIR):
     """hack to in-place update one row's info in the generated index html"""
 
-    title = link['title'] or latest_output(link)['title']
-    successful = len(tuple(filter(None, latest_output(link).values())))
+    latest = latest_output(link)
+    title = link['title'] or latest['title']
+    successful = sum(1 for output in latest.values() if output)
 
     # Patch JSON index
     changed = False
@@ -188,10 +211,12 @@ def patch_links_index(link, out_dir=OUTPUT_DIR):
     html_path = os.path.join(out_dir, 'index.html')
     with open(html_path, 'r') as html_file:
         html = html_file.read().splitlines()
+    title_tag = '<span data-title-for="{}"'.format(link['url'])
+    number_tag = '<span data-number-for="{}"'.format(link['url'])
     for idx, line in enumerate(html):
-        if title and ('<span data-title-for="{}"'.format(link['url']) in line):
+        if title and (title_tag in line):
             html[idx] = '<span>{}</span>'.format(title)
-        elif successful and ('<span data-number-for="{}"'.format(link['url']) in line):
+        elif successful and (number_tag in line):
             html[idx] = '<span>{}</span>'.format(successful)
             break
 
@@ -222,7 +247,7 @@ def parse_json_link_index(out_dir):
     existing_index = os.path.join(out_dir, 'index.json')
     if os.path.exists(existing_index):
         with open(existing_index, 'r', encoding='utf-8') as f:
-            link_json = json.load(f)
+            link_json = parse_json(f.read())
             check_link_structure(link_json)
             return link_json
     return {}
@@ -244,22 +269,21 @@ def load_json_link_index(out_dir, link):
 
 def write_html_link_index(out_dir, link):
     check_link_structure(link)
-    with open(os.path.join(TEMPLATES_DIR, 'link_index.html'), 'r', encoding='utf-8') as f:
-        link_html = f.read()
+    link_template = load_template('link_index.html')
 
     path = os.path.join(out_dir, 'index.html')
 
     link = derived_link_info(link)
 
     with open(path, 'w', encoding='utf-8') as f:
-        f.write(Template(link_html).substitute({
+        f.write(link_template.substitute({
             **link,
             'title': (
                 link['title']
                 or (link['base_url'] if link['is_archived'] else TITLE_LOADING_MSG)
             ),
             'archive_url': urlencode(
-                wget_output_path(link)
+                (wget_output_path(link) if link['is_static'] else link['archive_url'])
                 or (link['domain'] if link['is_archived'] else 'about:blank')
             ),
             'extension': link['extension'] or 'html',
@@ -33,6 +33,9 @@ from config import (
     URL_BLACKLIST,
 )
 
+ARCHIVABLE_SCHEMES = frozenset(('http', 'https', 'ftp'))
+
+
 def validate_links(links):
     check_links_structure(links)
     links = archivable_links(links)     # remove chrome://, about:, mailto: etc.
@@ -47,13 +50,13 @@ def validate_links(links):
         link['title'] = unescape(link['title'].strip()) if link['title'] else None
         check_link_structure(link)
 
-    return list(links)
+    return links
 
 
 def archivable_links(links):
     """remove chrome://, about:// or other schemed links that cant be archived"""
     for link in links:
-        scheme_is_valid = scheme(link['url']) in ('http', 'https', 'ftp')
+        scheme_is_valid = scheme(link['url']) in ARCHIVABLE_SCHEMES
         not_blacklisted = (not URL_BLACKLIST.match(link['url'])) if URL_BLACKLIST else True
         if scheme_is_valid and not_blacklisted:
             yield link
@@ -66,16 +69,12 @@ def uniquefied_links(sorted_links):
 
     unique_urls = OrderedDict()
 
-    lower = lambda url: url.lower().strip()
-    without_www = lambda url: url.replace('://www.', '://', 1)
-    without_trailing_slash = lambda url: url[:-1] if url[-1] == '/' else url.replace('/?', '?')
-
     for link in sorted_links:
-        fuzzy_url = without_www(without_trailing_slash(lower(link['url'])))
-        if fuzzy_url in unique_urls:
+        url_key = fuzzy_url(link['url'])
+        if url_key in unique_urls:
             # merge with any other links that share the same url
-            link = merge_links(unique_urls[fuzzy_url], link)
-        unique_urls[fuzzy_url] = link
+            link = merge_links(unique_urls[url_key], link)
+        unique_urls[url_key] = link
 
     unique_timestamps = OrderedDict()
     for link in unique_urls.values():
@@ -85,6 +84,16 @@ def uniquefied_links(sorted_links):
     return unique_timestamps.values()
 
 
+def fuzzy_url(url):
+    """key that links are deduped by, ignoring case, www. and trailing slashes"""
+
+    lower = lambda url: url.lower().strip()
+    without_www = lambda url: url.replace('://www.', '://', 1)
+    without_trailing_slash = lambda url: url[:-1] if url[-1] == '/' else url.replace('/?', '?')
+
+    return without_www(without_trailing_slash(lower(url)))
+
+
 def sorted_links(links):
     sort_func = lambda link: (link['timestamp'].split('.', 1)[0], link['url'])
     return sorted(links, key=sort_func, reverse=True)
@@ -95,9 +104,15 @@ def links_after_timestamp(links, timestamp=None):
         yield from links
         return
 
+    try:
+        resume_ts = float(timestamp)
+    except (ValueError, TypeError):
+        print('Resume value and all timestamp values must be valid numbers.')
+        return
+
     for link in links:
         try:
-            if float(link['timestamp']) <= float(timestamp):
+            if float(link['timestamp']) <= resume_ts:
                 yield link
         except (ValueError, TypeError):
             print('Resume value and all timestamp values must be valid numbers.')
@@ -1,4 +1,7 @@
 import sys
+from io import StringIO
+from threading import local
+from contextlib import contextmanager
 from datetime import datetime
 from config import ANSI, REPO_DIR, OUTPUT_DIR
 
@@ -21,6 +24,58 @@ _LAST_RUN_STATS = {
     'links': {},
 }
 
+# the colors never change after startup, so bake them into the message
+# templates once instead of re-formatting **ANSI into every line printed
+_PARSING_STARTED_MSG = '{green}[*] [{{}}] Parsing new links from output/sources/{{}}...{reset}'.format(**ANSI)
+_INDEXING_STARTED_MSG = '{green}[*] [{{}}] Saving main index files...{reset}'.format(**ANSI)
+_RESUMING_MSG = '{green}[▶] [{{}}] Resuming archive updating for {{}} pages starting from {{}}...{reset}'.format(**ANSI)
+_UPDATING_MSG = '{green}[▶] [{{}}] Updating content for {{}} pages in archive...{reset}'.format(**ANSI)
+_PAUSED_MSG = '\n{lightyellow}[X] [{{now}}] Downloading paused on link {{timestamp}} ({{idx}}/{{total}}){reset}'.format(**ANSI)
+_FINISHED_MSG = '{green}[√] [{{}}] Update of {{}} pages complete ({{}}){reset}'.format(**ANSI)
+_NEW_LINK_MSG = (
+    '\n[{green}+{reset}] [{green}{{now}}{reset}] "{{title}}"\n'
+    '    {blue}{{url}}{reset}\n'
+    '    > {{link_dir}}'
+).format(**ANSI)
+_EXISTING_LINK_MSG = (
+    '\n[{black}*{reset}] [{black}{{now}}{reset}] "{{title}}"\n'
+    '    {blue}{{url}}{reset}\n'
+    '    √ {{link_dir}}'
+).format(**ANSI)
+
+# per-thread output buffers used by buffered_output()
+_THREAD_OUTPUT = local()
+
+class ThreadBufferedStdout:
+    """stand-in for sys.stdout that sends the output of each thread inside
+       buffered_output() to that thread's buffer, everything else passes through
+    """
+
+    def __init__(self, stdout):
+        self.stdout = stdout
+
+    def write(self, text):
+        buffer = getattr(_THREAD_OUTPUT, 'buffer', None)
+        return (self.stdout if buffer is None else buffer).write(text)
+
+    def flush(self):
+        if getattr(_THREAD_OUTPUT, 'buffer', None) is None:
+            self.stdout.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stdout, name)
+
+@contextmanager
+def buffered_output():
+    """collect everything the current thread prints (sys.stdout must be a
+       ThreadBufferedStdout), so that it can be written out in one piece
+    """
+    _THREAD_OUTPUT.buffer = buffer = StringIO()
+    try:
+        yield buffer
+    finally:
+        _THREAD_OUTPUT.buffer = None
+
 def pretty_path(path):
     """convert paths like .../ArchiveBox/archivebox/../output/abc into output/abc"""
     return path.replace(REPO_DIR + '/', '')
@@ -31,10 +86,9 @@ def pretty_path(path):
 def log_parsing_started(source_file):
     start_ts = datetime.now()
     _LAST_RUN_STATS['parse_start_ts'] = start_ts
-    print('{green}[*] [{}] Parsing new links from output/sources/{}...{reset}'.format(
+    print(_PARSING_STARTED_MSG.format(
         start_ts.strftime('%Y-%m-%d %H:%M:%S'),
         source_file.rsplit('/', 1)[-1],
-        **ANSI,
     ))
 
 def log_parsing_finished(num_new_links, parser_name):
@@ -49,9 +103,8 @@ def log_parsing_finished(num_new_links, parser_name):
 def log_indexing_process_started():
     start_ts = datetime.now()
     _LAST_RUN_STATS['index_start_ts'] = start_ts
-    print('{green}[*] [{}] Saving main index files...{reset}'.format(
+    print(_INDEXING_STARTED_MSG.format(
         start_ts.strftime('%Y-%m-%d %H:%M:%S'),
-        **ANSI,
     ))
 
 def log_indexing_started(out_dir, out_file):
@@ -69,25 +122,22 @@ def log_archiving_started(num_links, resume):
     start_ts = datetime.now()
     _LAST_RUN_STATS['start_ts'] = start_ts
     if resume:
-        print('{green}[▶] [{}] Resuming archive updating for {} pages starting from {}...{reset}'.format(
+        print(_RESUMING_MSG.format(
              start_ts.strftime('%Y-%m-%d %H:%M:%S'),
              num_links,
              resume,
-             **ANSI,
         ))
     else:
-        print('{green}[▶] [{}] Updating content for {} pages in archive...{reset}'.format(
+        print(_UPDATING_MSG.format(
              start_ts.strftime('%Y-%m-%d %H:%M:%S'),
              num_links,
-             **ANSI,
         ))
 
 def log_archiving_paused(num_links, idx, timestamp):
     end_ts = datetime.now()
     _LAST_RUN_STATS['end_ts'] = end_ts
     print()
-    print('\n{lightyellow}[X] [{now}] Downloading paused on link {timestamp} ({idx}/{total}){reset}'.format(
-        **ANSI,
+    print(_PAUSED_MSG.format(
         now=end_ts.strftime('%Y-%m-%d %H:%M:%S'),
         idx=idx+1,
         timestamp=timestamp,
@@ -109,12 +159,10 @@ def log_archiving_finished(num_links):
     else:
         duration = '{0:.2f} sec'.format(seconds, 2)
 
-    print('{}[√] [{}] Update of {} pages complete ({}){}'.format(
-        ANSI['green'],
+    print(_FINISHED_MSG.format(
         end_ts.strftime('%Y-%m-%d %H:%M:%S'),
         num_links,
         duration,
-        ANSI['reset'],
     ))
     print('    - {} links skipped'.format(_LAST_RUN_STATS['skipped']))
     print('    - {} links updated'.format(_LAST_RUN_STATS['succeeded']))
@@ -127,17 +175,11 @@ def log_link_archiving_started(link_dir, link, is_new):
     #     http://www.benstopford.com/2015/02/14/log-structured-merge-trees/
     #     > output/archive/1478739709
 
-    print('\n[{symbol_color}{symbol}{reset}] [{symbol_color}{now}{reset}] "{title}"'.format(
-        symbol_color=ANSI['green' if is_new else 'black'],
-        symbol='+' if is_new else '*',
+    print((_NEW_LINK_MSG if is_new else _EXISTING_LINK_MSG).format(
         now=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
         title=link['title'] or link['url'],
-        **ANSI,
-    ))
-    print('    {blue}{url}{reset}'.format(url=link['url'], **ANSI))
-    print('    {} {}'.format(
-        '>' if is_new else '√',
-        pretty_path(link_dir),
+        url=link['url'],
+        link_dir=pretty_path(link_dir),
     ))
 
 def log_link_archiving_finished(link_dir, link, is_new, stats):
@@ -304,7 +304,7 @@ def parse_plain_text_export(text_file):
 
     text_file.seek(0)
     for line in text_file.readlines():
-        urls = re.findall(URL_REGEX, line) if line.strip() else ()
+        urls = URL_REGEX.findall(line) if line.strip() else ()
         for url in urls:
             yield {
                 'url': url,
@@ -2,6 +2,7 @@
 
 import re
 from argparse import ArgumentParser
+from concurrent.futures import ThreadPoolExecutor
 from os.path import exists, join
 from shutil import rmtree
 from typing import List
@@ -50,10 +51,19 @@ def cleanup_index(regexes: List[str], proceed: bool, delete: bool) -> None:
     write_html_links_index(OUTPUT_DIR, remaining)
 
     if delete:
-        for link, _ in filtered:
-            data_dir = join(ARCHIVE_DIR, link['timestamp'])
-            if exists(data_dir):
-                rmtree(data_dir)
+        data_dirs = [
+            join(ARCHIVE_DIR, link['timestamp'])
+            for link, _ in filtered
+        ]
+        # each rmtree is a long run of unlink/rmdir calls waiting on the disk,
+        # so remove several link folders at once
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(remove_dir, data_dirs))
+
+
+def remove_dir(data_dir: str) -> None:
+    if exists(data_dir):
+        rmtree(data_dir)
 
 
 if __name__ == '__main__':
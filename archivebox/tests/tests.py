@@ -2,7 +2,7 @@
 import json
 import os
 from os.path import dirname, pardir, join
-from subprocess import check_output, check_call
+from subprocess import check_output
 from tempfile import TemporaryDirectory
 from typing import List
 
@@ -40,10 +40,10 @@ class Helper:
         if env is None:
             env = {}
         env['OUTPUT_DIR'] = self.output_dir
-        check_call(
+        return check_output(
             [ARCHIVER_BIN, input_json],
             env={**os.environ.copy(), **env},
-        )
+        ).decode()
 
 
 class TestArchiver:
@@ -87,6 +87,59 @@ class TestArchiver:
             'CHECK_SSL_VALIDITY': 'False',
         })
 
+    def test_only_new_skips_fuzzy_duplicates(self):
+        """
+        An import that only differs from an existing link by www. or a trailing slash is merged into it, so ONLY_NEW must not archive it again.
+        """
+        with TemporaryDirectory() as output_dir:
+            h = Helper(output_dir)
+            env = {
+                'FETCH_TITLE': 'False',
+                'FETCH_FAVICON': 'False',
+                'FETCH_WGET': 'False',
+                'FETCH_WARC': 'False',
+                'FETCH_SCREENSHOT': 'False',
+                'FETCH_PDF': 'False',
+                'FETCH_DOM': 'False',
+                'FETCH_GIT': 'False',
+                'FETCH_MEDIA': 'False',
+            }
+
+            h.run(links=['https://localhost:123/page'], env=env)
+            output = h.run(links=['https://www.localhost:123/page/'], env={**env, 'ONLY_NEW': 'True'})
+
+            assert 'Adding 0 new links' in output
+            assert 'Updating content for 0 pages' in output
+
+    def test_concurrent_archiving(self):
+        """
+        Archiving several links at once should still save every link's results to the index and count each link once in the run stats.
+        """
+        with TemporaryDirectory() as output_dir:
+            h = Helper(output_dir)
+            urls = [f'https://localhost:123/concurrent_{i}.html' for i in range(6)]
+
+            output = h.run(links=urls, env={
+                'ARCHIVE_CONCURRENCY': '3',
+                'FETCH_FAVICON': 'False',
+                'FETCH_SCREENSHOT': 'False',
+                'FETCH_PDF': 'False',
+                'FETCH_DOM': 'False',
+                'CHECK_SSL_VALIDITY': 'False',
+            })
+
+            with open(join(output_dir, 'index.json')) as f:
+                index = json.load(f)
+            assert sorted(link['url'] for link in index['links']) == sorted(urls)
+            for link in index['links']:
+                # the links are unreachable, but each attempt is still recorded
+                assert len(link['history']['wget']) == 1
+                with open(join(output_dir, 'archive', link['timestamp'], 'index.json')) as f:
+                    assert json.load(f)['history'] == link['history']
+
+            assert '- 0 links updated' in output
+            assert '- 6 links had errors' in output
+
 
 if __name__ == '__main__':
     pytest.main([__file__])
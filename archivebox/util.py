@@ -71,6 +71,10 @@ HTML_TITLE_REGEX = re.compile(
     r'(.[^<>]+)',                      # get everything up to these symbols
     re.IGNORECASE | re.MULTILINE | re.DOTALL | re.UNICODE,
 )
+HTML_FILE_REGEX = re.compile(
+    r'.+\.[Hh][Tt][Mm][Ll]?$',        # filenames ending in .htm or .html
+    re.IGNORECASE | re.MULTILINE,
+)
 STATICFILE_EXTENSIONS = {
     # 99.999% of the time, URLs ending in these extensions are static files
     # that can be downloaded as-is, not html pages that need to be rendered
@@ -99,7 +103,7 @@ def check_link_structure(link):
     assert isinstance(link, dict)
     assert isinstance(link.get('url'), str)
     assert len(link['url']) > 2
-    assert len(re.findall(URL_REGEX, link['url'])) == 1
+    assert len(URL_REGEX.findall(link['url'])) == 1
     if 'history' in link:
         assert isinstance(link['history'], dict), 'history must be a Dict'
         for key, val in link['history'].items():
@@ -137,15 +141,14 @@ def check_url_parsing_invariants():
     and example14.badb
     <or>htt://example15.badc</that>
     '''
-    # print('\n'.join(re.findall(URL_REGEX, test_urls)))
-    assert len(re.findall(URL_REGEX, test_urls)) == 12
+    # print('\n'.join(URL_REGEX.findall(test_urls)))
+    assert len(URL_REGEX.findall(test_urls)) == 12
 
 
 ### Random Helpers
 
 def save_stdin_source(raw_text):
-    if not os.path.exists(SOURCES_DIR):
-        os.makedirs(SOURCES_DIR)
+    os.makedirs(SOURCES_DIR, exist_ok=True)
 
     ts = str(datetime.now().timestamp()).split('.', 1)[0]
 
@@ -159,8 +162,7 @@ def save_stdin_source(raw_text):
 def save_remote_source(url, timeout=TIMEOUT):
     """download a given url's content into output/sources/domain-<timestamp>.txt"""
 
-    if not os.path.exists(SOURCES_DIR):
-        os.makedirs(SOURCES_DIR)
+    os.makedirs(SOURCES_DIR, exist_ok=True)
 
     ts = str(datetime.now().timestamp()).split('.', 1)[0]
 
@@ -204,7 +206,7 @@ def fetch_page_title(url, timeout=10, progress=SHOW_PROGRESS):
             sys.stdout.flush()
 
         html = download_url(url, timeout=timeout)
-        match = re.search(HTML_TITLE_REGEX, html)
+        match = HTML_TITLE_REGEX.search(html)
         return match.group(1).strip() if match else None
     except Exception as err:  # noqa
         # print('[!] Failed to fetch title because of {}: {}'.format(
@@ -263,15 +265,21 @@ def wget_output_path(link):
     )
 
     for _ in range(4):
-        if os.path.exists(search_dir):
-            if os.path.isdir(search_dir):
-                html_files = [
-                    f for f in os.listdir(search_dir)
-                    if re.search(".+\\.[Hh][Tt][Mm][Ll]?$", f, re.I | re.M)
-                ]
-                if html_files:
-                    path_from_link_dir = search_dir.split(link_dir)[-1].strip('/')
-                    return os.path.join(path_from_link_dir, html_files[0])
+        # a single scandir both checks that search_dir is a directory and
+        # lists it, and entry.is_file() reuses the type info from readdir
+        # only the first html file is used, so stop reading the folder there
+        try:
+            with os.scandir(search_dir) as entries:
+                html_file = next((
+                    entry.name for entry in entries
+                    if entry.is_file() and HTML_FILE_REGEX.search(entry.name)
+                ), None)
+        except (FileNotFoundError, NotADirectoryError):
+            html_file = None
+
+        if html_file:
+            path_from_link_dir = search_dir.split(link_dir)[-1].strip('/')
+            return os.path.join(path_from_link_dir, html_file)
 
         # Move up one directory level
         search_dir = search_dir.rsplit('/', 1)[0]
@@ -326,6 +334,7 @@ def derived_link_info(link):
     """extend link info with the archive urls and other derived data"""
 
     url = link['url']
+    url_domain = domain(url)
 
     to_date_str = lambda ts: datetime.fromtimestamp(Decimal(ts)).strftime('%Y-%m-%d %H:%M')
 
@@ -334,7 +343,7 @@ def derived_link_info(link):
         'link_dir': '{}/{}'.format(ARCHIVE_DIR_NAME, link['timestamp']),
         'bookmarked_date': to_date_str(link['timestamp']),
         'updated_date': to_date_str(link['updated']) if 'updated' in link else None,
-        'domain': domain(url),
+        'domain': url_domain,
         'path': path(url),
         'basename': basename(url),
         'extension': extension(url),
@@ -343,9 +352,9 @@ def derived_link_info(link):
         'is_archived': os.path.exists(os.path.join(
             ARCHIVE_DIR,
             link['timestamp'],
-            domain(url),
+            url_domain,
         )),
-        'num_outputs': len([entry for entry in latest_output(link).values() if entry]),
+        'num_outputs': sum(1 for entry in latest_output(link).values() if entry),
     }
 
     # Archive Method Output URLs
@@ -365,13 +374,13 @@ def derived_link_info(link):
     # static binary files like PDF and images are handled slightly differently.
     # they're just downloaded once and aren't archived separately multiple times, 
     # so the wget, screenshot, & pdf urls should all point to the same file
-    if is_static_file(url):
+    if extended_info['is_static']:
         extended_info.update({
-            'title': basename(url),
-            'archive_url': base_url(url),
-            'pdf_url': base_url(url),
-            'screenshot_url': base_url(url),
-            'dom_url': base_url(url),
+            'title': extended_info['basename'],
+            'archive_url': extended_info['base_url'],
+            'pdf_url': extended_info['base_url'],
+            'screenshot_url': extended_info['base_url'],
+            'dom_url': extended_info['base_url'],
         })
 
     return extended_info
@@ -399,9 +408,10 @@ def latest_output(link, status=None):
         if status is not None:
             history = filter(lambda result: result['status'] == status, history)
 
-        history = list(history)
-        if history:
-            latest[archive_method] = history[0]['output']
+        # only the most recent matching result is needed, so stop at the first one
+        latest_result = next(history, None)
+        if latest_result:
+            latest[archive_method] = latest_result['output']
 
     return latest
 
@@ -534,14 +544,59 @@ def download_url(url, timeout=TIMEOUT):
 def chmod_file(path, cwd='.', permissions=OUTPUT_PERMISSIONS, timeout=30):
     """chmod -R <permissions> <cwd>/<path>"""
 
-    if not os.path.exists(os.path.join(cwd, path)):
+    full_path = os.path.join(cwd, path)
+    if not os.path.exists(full_path):
         raise Exception('Failed to chmod: {} does not exist (did the previous step fail?)'.format(path))
 
-    chmod_result = run(['chmod', '-R', permissions, path], cwd=cwd, stdout=DEVNULL, stderr=PIPE, timeout=timeout)
-    if chmod_result.returncode == 1:
-        print('     ', chmod_result.stderr.decode())
+    try:
+        mode = int(permissions, 8)
+    except ValueError:
+        # symbolic permissions like u=rwX,go=rX are left to the chmod binary
+        chmod_result = run(['chmod', '-R', permissions, path], cwd=cwd, stdout=DEVNULL, stderr=PIPE, timeout=timeout)
+        if chmod_result.returncode == 1:
+            print('     ', chmod_result.stderr.decode())
+            raise Exception('Failed to chmod {}/{}'.format(cwd, path))
+        return
+
+    # octal permissions are applied in-process instead of forking chmod -R
+    # for every file, walking folders with scandir to reuse each entry's type.
+    # timeout only bounds the chmod subprocess above, so it isn't used here
+    errors = []
+    try:
+        os.chmod(full_path, mode)
+    except OSError as err:
+        errors.append(err)
+    if os.path.isdir(full_path):
+        errors += chmod_tree(full_path, mode)
+
+    # like chmod -R, finish the whole tree before reporting what failed
+    if errors:
+        for err in errors:
+            print('     ', err)
         raise Exception('Failed to chmod {}/{}'.format(cwd, path))
 
+def chmod_tree(dir_path, mode):
+    """chmod every file and folder below dir_path, without following symlinks (like chmod -R)
+       keeps going past entries that can't be changed, and returns the errors it hit
+    """
+
+    errors = []
+    try:
+        with os.scandir(dir_path) as entries:
+            for entry in entries:
+                if entry.is_symlink():
+                    continue
+                try:
+                    os.chmod(entry.path, mode)
+                except OSError as err:
+                    errors.append(err)
+                if entry.is_dir(follow_symlinks=False):
+                    errors += chmod_tree(entry.path, mode)
+    except OSError as err:
+        errors.append(err)
+
+    return errors
+
 
 def chrome_args(**options):
     """helper to build up a chrome shell command with arguments"""